@@ -2,6 +2,7 @@
 import axios from "axios";
 import io from "socket.io-client";
 import JSON5 from "json5";
+import { decode } from "@msgpack/msgpack";
 import env from "env.json";
 import Cookies from "universal-cookie";
 import { useEffect, useReducer, useRef, useState } from "react";
@@ -269,11 +270,13 @@ export const connect = async (
 ) => {
   // Get backend URL object from the endpoint.
   const endpoint = new URL(EVENTURL);
-  // Create the socket.
+  // Create the socket. The msgpack query param advertises that this client
+  // can decode binary MessagePack state updates.
   socket.current = io(EVENTURL, {
     path: endpoint["pathname"],
     transports: transports,
     autoUnref: false,
+    query: { msgpack: "true" },
   });
 
   // Once the socket is open, hydrate the page.
@@ -285,9 +288,10 @@ export const connect = async (
     setConnectError(error)
   });
 
-  // On each received message, queue the updates and events.
+  // On each received message, queue the updates and events. Binary frames
+  // are MessagePack, text frames are JSON.
   socket.current.on("event", message => {
-    const update = JSON5.parse(message)
+    const update = typeof message === "string" ? JSON5.parse(message) : decode(new Uint8Array(message))
     dispatch(update.delta)
     applyClientStorageDelta(client_storage, update.delta)
     event_processing = !update.final
@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import inspect
 import os
-from multiprocessing.pool import ThreadPool
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import (
     Any,
     AsyncIterator,
@@ -13,6 +15,7 @@ from typing import (
     Dict,
     List,
     Optional,
+    Set,
     Type,
     Union,
 )
@@ -52,10 +55,30 @@ from reflex.route import (
 from reflex.state import DefaultState, State, StateManager, StateUpdate
 from reflex.utils import console, format, prerequisites, types
 
+try:
+    import uvloop
+except ImportError:
+    # uvloop is optional and not available on all platforms (e.g. Windows).
+    uvloop = None
+
+try:
+    import msgpack
+except ImportError:
+    # msgpack is optional; state updates fall back to JSON text frames.
+    msgpack = None
+
 # Define custom types.
 ComponentCallable = Callable[[], Component]
 Reducer = Callable[[Event], Coroutine[Any, Any, StateUpdate]]
 
+# Precompute the endpoint and socket event names used on hot paths, so the
+# enum-to-str conversion is not repeated on every call.
+_PING_ENDPOINT = str(constants.Endpoint.PING)
+_UPLOAD_ENDPOINT = str(constants.Endpoint.UPLOAD)
+_EVENT_ENDPOINT = str(constants.Endpoint.EVENT)
+_EVENT_SOCKET_EVENT = str(constants.SocketEvent.EVENT)
+_PING_SOCKET_EVENT = str(constants.SocketEvent.PING)
+
 
 def default_overlay_component() -> Component:
     """Default overlay_component attribute for App.
@@ -146,11 +169,26 @@ class App(Base):
                     f" Defaulting to root state: ({inferred_state.__name__})"
                 )
             self.state = inferred_state
+        # Use the faster uvloop event loop if it is available.
+        if (
+            uvloop is not None
+            and os.environ.get(constants.DISABLE_UVLOOP_ENV_VAR) != "yes"
+        ):
+            uvloop.install()
+
         # Get the config
         config = get_config()
 
         # Add middleware.
-        self.middleware.append(HydrateMiddleware())
+        self.add_middleware(HydrateMiddleware())
+
+        # Memoize the load events per route, as they are static after setup.
+        self._get_load_events = functools.lru_cache(maxsize=None)(
+            self._load_events_for_route
+        )
+
+        # Catchall metadata per route, computed once when the page is added.
+        self._route_catchall: Dict[str, tuple[str, str]] = {}
 
         # Set up the state manager.
         self.state_manager.setup(state=self.state)
@@ -185,7 +223,7 @@ class App(Base):
         # Register the event namespace with the socket.
         self.sio.register_namespace(self.event_namespace)
         # Mount the socket app with the API.
-        self.api.mount(str(constants.Endpoint.EVENT), self.socket_app)
+        self.api.mount(_EVENT_ENDPOINT, self.socket_app)
 
         # Set up the admin dash.
         self.setup_admin_dash()
@@ -216,10 +254,10 @@ class App(Base):
     def add_default_endpoints(self):
         """Add the default endpoints."""
         # To test the server.
-        self.api.get(str(constants.Endpoint.PING))(ping)
+        self.api.get(_PING_ENDPOINT)(ping)
 
         # To upload files.
-        self.api.post(str(constants.Endpoint.UPLOAD))(upload(self))
+        self.api.post(_UPLOAD_ENDPOINT)(upload(self))
 
     def add_cors(self):
         """Add CORS middleware to the app."""
@@ -247,11 +285,11 @@ class App(Base):
         Returns:
             An optional state to return.
         """
-        for middleware in self.middleware:
-            if asyncio.iscoroutinefunction(middleware.preprocess):
-                out = await middleware.preprocess(app=self, state=state, event=event)  # type: ignore
+        for is_async, hook in self._preprocess_hooks:
+            if is_async:
+                out = await hook(app=self, state=state, event=event)  # type: ignore
             else:
-                out = middleware.preprocess(app=self, state=state, event=event)  # type: ignore
+                out = hook(app=self, state=state, event=event)  # type: ignore
             if out is not None:
                 return out  # type: ignore
 
@@ -271,13 +309,13 @@ class App(Base):
         Returns:
             The state update to return.
         """
-        for middleware in self.middleware:
-            if asyncio.iscoroutinefunction(middleware.postprocess):
-                out = await middleware.postprocess(
+        for is_async, hook in self._postprocess_hooks:
+            if is_async:
+                out = await hook(
                     app=self, state=state, event=event, update=update  # type: ignore
                 )
             else:
-                out = middleware.postprocess(
+                out = hook(
                     app=self, state=state, event=event, update=update  # type: ignore
                 )
             if out is not None:
@@ -295,6 +333,25 @@ class App(Base):
             self.middleware.append(middleware)
         else:
             self.middleware.insert(index, middleware)
+        self._classify_middleware()
+
+    def _classify_middleware(self):
+        """Classify each middleware hook as sync or async once at registration.
+
+        This avoids calling asyncio.iscoroutinefunction on every event for
+        every middleware in preprocess and postprocess.
+        """
+        self._preprocess_hooks = tuple(
+            (asyncio.iscoroutinefunction(middleware.preprocess), middleware.preprocess)
+            for middleware in self.middleware
+        )
+        self._postprocess_hooks = tuple(
+            (
+                asyncio.iscoroutinefunction(middleware.postprocess),
+                middleware.postprocess,
+            )
+            for middleware in self.middleware
+        )
 
     @staticmethod
     def _generate_component(component: Component | ComponentCallable) -> Component:
@@ -367,15 +424,21 @@ class App(Base):
         self.state.setup_dynamic_args(get_route_args(route))
 
         # Generate the component if it is a callable.
+        caller_owns_component = isinstance(component, Component)
         component = self._generate_component(component)
 
-        # Wrap the component in a fragment with optional overlay.
+        # Wrap the component in a fragment with optional overlay. Without an
+        # overlay the wrap is skipped to keep the component tree one level
+        # shallower for every downstream traversal.
         if self.overlay_component is not None:
             component = Fragment.create(
                 self._generate_component(self.overlay_component),
                 component,
             )
-        else:
+        elif script_tags or caller_owns_component:
+            # Keep a Fragment root so the metadata and script tags are not
+            # appended into a component instance owned by the caller, which
+            # may be reused on other routes.
             component = Fragment.create(component)
 
         # Add meta information to the component.
@@ -395,15 +458,34 @@ class App(Base):
         self._check_routes_conflict(route)
         self.pages[route] = component
 
+        # Cache the catchall metadata for future conflict checks.
+        conflict_route = "" if route == "index" else route
+        self._route_catchall[conflict_route] = (
+            catchall_in_route(conflict_route),
+            catchall_prefix(conflict_route),
+        )
+
         # Add the load events.
         if on_load:
             if not isinstance(on_load, list):
                 on_load = [on_load]
             self.load_events[route] = on_load
+            self._get_load_events.cache_clear()
 
     def get_load_events(self, route: str) -> list[EventHandler | EventSpec]:
         """Get the load events for a route.
 
+        Args:
+            route: The route to get the load events for.
+
+        Returns:
+            The load events for the route.
+        """
+        return self._get_load_events(route)
+
+    def _load_events_for_route(self, route: str) -> list[EventHandler | EventSpec]:
+        """Compute the load events for a route (memoized via _get_load_events).
+
         Args:
             route: The route to get the load events for.
 
@@ -429,21 +511,15 @@ class App(Base):
         newroute_catchall = catchall_in_route(new_route)
         if not newroute_catchall:
             return
+        newroute_prefix = catchall_prefix(new_route)
 
-        for route in self.pages:
-            route = "" if route == "index" else route
-
+        for route, (route_catchall, route_prefix) in self._route_catchall.items():
             if new_route.startswith(f"{route}/[[..."):
                 raise ValueError(
                     f"You cannot define a route with the same specificity as a optional catch-all route ('{route}' and '{new_route}')"
                 )
 
-            route_catchall = catchall_in_route(route)
-            if (
-                route_catchall
-                and newroute_catchall
-                and catchall_prefix(route) == catchall_prefix(new_route)
-            ):
+            if route_catchall and route_prefix == newroute_prefix:
                 raise ValueError(
                     f"You cannot use multiple catchall for the same dynamic route ({route} !== {new_route})"
                 )
@@ -517,19 +593,21 @@ class App(Base):
         Example:
             >>> get_frontend_packages({"react": "16.14.0", "react-dom": "16.14.0"})
         """
+        default_import_keys = frozenset(compiler.DEFAULT_IMPORTS)
         page_imports = {
             i
             for i in imports
-            if i not in compiler.DEFAULT_IMPORTS.keys()
+            if i not in default_import_keys
             and i != "focus-visible/dist/focus-visible"
             and "next" not in i
             and not i.startswith("/")
             and i != ""
         }
-        frontend_packages = get_config().frontend_packages
+        config = get_config()
+        tailwind_plugins = frozenset((config.tailwind or {}).get("plugins", []))  # type: ignore
         _frontend_packages = []
-        for package in frontend_packages:
-            if package in (get_config().tailwind or {}).get("plugins", []):  # type: ignore
+        for package in config.frontend_packages:
+            if package in tailwind_plugins:
                 console.warn(
                     f"Tailwind packages are inferred from 'plugins', remove `{package}` from `frontend_packages`"
                 )
@@ -570,63 +648,60 @@ class App(Base):
         # Store the compile results.
         compile_results = []
 
-        # Compile the pages in parallel.
+        # Compile the pages in parallel. Threads are used rather than worker
+        # processes because the component trees reference wrapped event
+        # handlers that do not survive pickling.
         custom_components = set()
-        # TODO Anecdotally, processes=2 works 10% faster (cpu_count=12)
-        thread_pool = ThreadPool()
+        executor = ThreadPoolExecutor(max_workers=os.cpu_count())
         all_imports = {}
-        with progress:
+        page_jobs = []
+        with progress, executor:
             for route, component in self.pages.items():
-                # TODO: this progress does not reflect actual threaded task completion
+                # TODO: this progress does not reflect actual task completion
                 progress.advance(task)
                 component.add_style(self.style)
-                compile_results.append(
-                    thread_pool.apply_async(
-                        compiler.compile_page,
-                        args=(
-                            route,
-                            component,
-                            self.state,
-                        ),
-                    )
+                page_jobs.append((route, component, self.state))
+
+            # Compile the page batch, merging the imports and custom components
+            # that the workers collected while traversing each component tree.
+            for (
+                output_path,
+                code,
+                page_imports,
+                page_custom_components,
+            ) in compiler.compile_pages(page_jobs, executor=executor):
+                compile_results.append((output_path, code))
+                all_imports.update(page_imports)
+                custom_components |= page_custom_components
+
+            # Compile the remaining artifacts in parallel; they have no data
+            # dependencies on each other.
+            extra_futures = [
+                # Compile the custom components.
+                executor.submit(compiler.compile_components, custom_components),
+                # Compile the root document with base styles and fonts.
+                executor.submit(compiler.compile_document_root, self.stylesheets),
+                # Compile the theme.
+                executor.submit(compiler.compile_theme, self.style),
+                # Compile the contexts.
+                executor.submit(compiler.compile_contexts, self.state),
+            ]
+
+            # Compile the Tailwind config.
+            if config.tailwind is not None:
+                config.tailwind["content"] = config.tailwind.get(
+                    "content", constants.TAILWIND_CONTENT
+                )
+                extra_futures.append(
+                    executor.submit(compiler.compile_tailwind, config.tailwind)
                 )
-                # add component.get_imports() to all_imports
-                all_imports.update(component.get_imports())
-
-                # Add the custom components from the page to the set.
-                custom_components |= component.get_custom_components()
-
-        thread_pool.close()
-        thread_pool.join()
-
-        # Get the results.
-        compile_results = [result.get() for result in compile_results]
-
-        # TODO the compile tasks below may also benefit from parallelization too
 
-        # Compile the custom components.
-        compile_results.append(compiler.compile_components(custom_components))
+            compile_results.extend(future.result() for future in extra_futures)
 
         # Iterate through all the custom components and add their imports to the all_imports
         for component in custom_components:
             all_imports.update(component.get_imports())
 
-        # Compile the root document with base styles and fonts
-        compile_results.append(compiler.compile_document_root(self.stylesheets))
-
-        # Compile the theme.
-        compile_results.append(compiler.compile_theme(self.style))
-
-        # Compile the contexts.
-        compile_results.append(compiler.compile_contexts(self.state))
-
-        # Compile the Tailwind config.
-        if config.tailwind is not None:
-            config.tailwind["content"] = config.tailwind.get(
-                "content", constants.TAILWIND_CONTENT
-            )
-            compile_results.append(compiler.compile_tailwind(config.tailwind))
-
         # Empty the .web pages directory
         compiler.purge_web_pages_dir()
 
@@ -634,11 +709,17 @@ class App(Base):
         self.get_frontend_packages(all_imports)
 
         # Write the pages at the end to trigger the NextJS hot reload only once.
-        thread_pool = ThreadPool()
-        for output_path, code in compile_results:
-            thread_pool.apply_async(compiler_utils.write_page, args=(output_path, code))
-        thread_pool.close()
-        thread_pool.join()
+        # Writing is I/O-bound, so threads are sufficient here. Collect each
+        # result as it completes so write errors propagate immediately.
+        with ThreadPoolExecutor(
+            max_workers=min(32, (os.cpu_count() or 1) * 4)
+        ) as executor:
+            write_futures = [
+                executor.submit(compiler_utils.write_page, output_path, code)
+                for output_path, code in compile_results
+            ]
+            for future in as_completed(write_futures):
+                future.result()
 
 
 async def process(
@@ -656,45 +737,66 @@ async def process(
     Yields:
         The state updates after processing the event.
     """
-    # Get the state for the session.
-    state = app.state_manager.get_state(event.token)
-
-    # Add request data to the state.
-    router_data = event.router_data
-    router_data.update(
-        {
-            constants.RouteVar.QUERY: format.format_query_params(event.router_data),
-            constants.RouteVar.CLIENT_TOKEN: event.token,
-            constants.RouteVar.SESSION_ID: sid,
-            constants.RouteVar.HEADERS: headers,
-            constants.RouteVar.CLIENT_IP: client_ip,
-        }
-    )
-    # re-assign only when the value is different
-    if state.router_data != router_data:
-        # assignment will recurse into substates and force recalculation of
-        # dependent ComputedVar (dynamic route variables)
-        state.router_data = router_data
-
-    # Preprocess the event.
-    update = await app.preprocess(state, event)
-
-    # If there was an update, yield it.
-    if update is not None:
-        yield update
-
-    # Only process the event if there is no update.
-    else:
-        # Process the event.
-        async for update in state._process(event):
-            # Postprocess the event.
-            update = await app.postprocess(state, event, update)
-
-            # Yield the update.
+    # Get the state for the session, persisting it when the event is done.
+    with app.state_manager.session(event.token) as state:
+        # Add request data to the state, assigning in place to avoid building
+        # an intermediate dict on every event.
+        router_data = event.router_data
+        router_data[constants.RouteVar.QUERY] = format.format_query_params(
+            event.router_data
+        )
+        router_data[constants.RouteVar.CLIENT_TOKEN] = event.token
+        router_data[constants.RouteVar.SESSION_ID] = sid
+        router_data[constants.RouteVar.HEADERS] = headers
+        router_data[constants.RouteVar.CLIENT_IP] = client_ip
+        # re-assign only when the value is different, comparing a cheap hash
+        # instead of deep-comparing the dicts on every event
+        router_data_hash = hash(
+            tuple(sorted((name, repr(value)) for name, value in router_data.items()))
+        )
+        if getattr(state, "_router_data_hash", None) != router_data_hash:
+            # assignment will recurse into substates and force recalculation of
+            # dependent ComputedVar (dynamic route variables)
+            state.router_data = router_data
+            # Store the hash outside the var machinery, so it is not tracked
+            # as a backend var or marked dirty.
+            object.__setattr__(state, "_router_data_hash", router_data_hash)
+
+        # Preprocess the event.
+        update = await app.preprocess(state, event)
+
+        # If there was an update, yield it.
+        if update is not None:
             yield update
 
-    # Set the state for the session.
-    app.state_manager.set_state(event.token, state)
+        # Only process the event if there is no update.
+        else:
+            # Process the event.
+            async for update in state._process(event):
+                # Postprocess the event.
+                update = await app.postprocess(state, event, update)
+
+                # Yield the update.
+                yield update
+
+
+@functools.lru_cache(maxsize=None)
+def _find_upload_param(fn: Callable) -> tuple:
+    """Find the handler arg annotated as List[UploadFile], if any.
+
+    Cached on the function object, since a handler's annotations never
+    change after definition.
+
+    Args:
+        fn: The handler function to inspect.
+
+    Returns:
+        The (name, annotation) pair of the upload param, or an empty tuple.
+    """
+    for k, v in inspect.getfullargspec(fn).annotations.items():
+        if types.is_generic_alias(v) and types._issubclass(v.__args__[0], UploadFile):
+            return (k, v)
+    return ()
 
 
 async def ping() -> str:
@@ -730,48 +832,42 @@ def upload(app: App):
         for file in files:
             assert file.filename is not None
             file.filename = file.filename.split(":")[-1]
-        # Get the state for the session.
-        state = app.state_manager.get_state(token)
-        # get the current session ID
-        sid = state.get_sid()
-        # get the current state(parent state/substate)
-        path = handler.split(".")[:-1]
-        current_state = state.get_substate(path)
-        handler_upload_param = ()
-
-        # get handler function
-        func = getattr(current_state, handler.split(".")[-1])
-
-        # check if there exists any handler args with annotation, List[UploadFile]
-        for k, v in inspect.getfullargspec(
-            func.fn if isinstance(func, EventHandler) else func
-        ).annotations.items():
-            if types.is_generic_alias(v) and types._issubclass(
-                v.__args__[0], UploadFile
-            ):
-                handler_upload_param = (k, v)
-                break
-
-        if not handler_upload_param:
-            raise ValueError(
-                f"`{handler}` handler should have a parameter annotated as List["
-                f"rx.UploadFile]"
+        # Get the state for the session, persisting it when the event is done.
+        with app.state_manager.session(token) as state:
+            # get the current session ID
+            sid = state.get_sid()
+            # get the current state(parent state/substate)
+            path = handler.split(".")[:-1]
+            current_state = state.get_substate(path)
+
+            # get handler function
+            func = getattr(current_state, handler.split(".")[-1])
+
+            # check if there exists any handler args with annotation, List[UploadFile]
+            handler_upload_param = _find_upload_param(
+                func.fn if isinstance(func, EventHandler) else func
             )
 
-        event = Event(
-            token=token,
-            name=handler,
-            payload={handler_upload_param[0]: files},
-        )
-        async for update in state._process(event):
-            # Postprocess the event.
-            update = await app.postprocess(state, event, update)
-            # Send update to client
-            await asyncio.create_task(
-                app.event_namespace.emit(str(constants.SocketEvent.EVENT), update.json(), to=sid)  # type: ignore
+            if not handler_upload_param:
+                raise ValueError(
+                    f"`{handler}` handler should have a parameter annotated as List["
+                    f"rx.UploadFile]"
+                )
+
+            event = Event(
+                token=token,
+                name=handler,
+                payload={handler_upload_param[0]: files},
             )
-        # Set the state for the session.
-        app.state_manager.set_state(event.token, state)
+            async for update in state._process(event):
+                # Postprocess the event.
+                update = await app.postprocess(state, event, update)
+                # Send update to client
+                await app.event_namespace.emit(  # type: ignore
+                    _EVENT_SOCKET_EVENT,
+                    app.event_namespace.serialize_update(sid, update),  # type: ignore
+                    to=sid,
+                )
 
     return upload_file
 
@@ -791,15 +887,61 @@ class EventNamespace(AsyncNamespace):
         """
         super().__init__(namespace)
         self.app = app
+        # Per-session decoded headers and client IP, cached at connect time.
+        self._client_headers: Dict[str, Dict[str, str]] = {}
+        self._client_ips: Dict[str, str] = {}
+        # Sessions that negotiated MessagePack updates on connect.
+        self._msgpack_sids: Set[str] = set()
+
+    @staticmethod
+    def _decode_headers(environ: Dict) -> Dict[str, str]:
+        """Decode the client headers from the ASGI scope.
+
+        Args:
+            environ: The request information, including HTTP headers.
+
+        Returns:
+            The decoded headers.
+        """
+        return {
+            k.decode("utf-8"): v.decode("utf-8")
+            for (k, v) in environ["asgi.scope"]["headers"]
+        }
+
+    def serialize_update(self, sid, update: StateUpdate) -> Union[str, bytes]:
+        """Serialize a state update for a session.
+
+        Args:
+            sid: The Socket.IO session id.
+            update: The state update to serialize.
+
+        Returns:
+            A MessagePack binary frame for sessions that negotiated it on
+            connect, otherwise a JSON string.
+        """
+        if sid in self._msgpack_sids:
+            return msgpack.packb(update.dict(), default=list)
+        return update.json()
 
     def on_connect(self, sid, environ):
         """Event for when the websocket is connected.
 
+        The headers for a session never change after connect, so decode them
+        once here instead of on every event.
+
         Args:
             sid: The Socket.IO session id.
             environ: The request information, including HTTP headers.
         """
-        pass
+        self._client_headers[sid] = self._decode_headers(environ)
+        self._client_ips[sid] = environ["REMOTE_ADDR"]
+
+        # Clients advertise MessagePack support via a query param; legacy
+        # clients that do not keep receiving JSON text frames.
+        if msgpack is not None:
+            query_params = urllib.parse.parse_qs(environ.get("QUERY_STRING", ""))
+            if "true" in query_params.get("msgpack", []):
+                self._msgpack_sids.add(sid)
 
     def on_disconnect(self, sid):
         """Event for when the websocket disconnects.
@@ -807,7 +949,9 @@ class EventNamespace(AsyncNamespace):
         Args:
             sid: The Socket.IO session id.
         """
-        pass
+        self._client_headers.pop(sid, None)
+        self._client_ips.pop(sid, None)
+        self._msgpack_sids.discard(sid)
 
     async def on_event(self, sid, data):
         """Event for receiving front-end websocket events.
@@ -819,26 +963,21 @@ class EventNamespace(AsyncNamespace):
         # Get the event.
         event = Event.parse_raw(data)
 
-        # Get the event environment.
-        assert self.app.sio is not None
-        environ = self.app.sio.get_environ(sid, self.namespace)
-        assert environ is not None
-
-        # Get the client headers.
-        headers = {
-            k.decode("utf-8"): v.decode("utf-8")
-            for (k, v) in environ["asgi.scope"]["headers"]
-        }
-
-        # Get the client IP
-        client_ip = environ["REMOTE_ADDR"]
+        # Get the cached client headers and IP for this session.
+        headers = self._client_headers.get(sid)
+        if headers is None:
+            # The connect event was missed; decode from the environment.
+            assert self.app.sio is not None
+            environ = self.app.sio.get_environ(sid, self.namespace)
+            assert environ is not None
+            headers = self._client_headers[sid] = self._decode_headers(environ)
+            self._client_ips[sid] = environ["REMOTE_ADDR"]
+        client_ip = self._client_ips[sid]
 
         # Process the events.
         async for update in process(self.app, event, sid, headers, client_ip):
             # Emit the event.
-            await asyncio.create_task(
-                self.emit(str(constants.SocketEvent.EVENT), update.json(), to=sid)
-            )
+            await self.emit(_EVENT_SOCKET_EVENT, self.serialize_update(sid, update), to=sid)
 
     async def on_ping(self, sid):
         """Event for testing the API endpoint.
@@ -847,4 +986,4 @@ class EventNamespace(AsyncNamespace):
             sid: The Socket.IO session id.
         """
         # Emit the test event.
-        await self.emit(str(constants.SocketEvent.PING), "pong", to=sid)
+        await self.emit(_PING_SOCKET_EVENT, "pong", to=sid)
@@ -1,7 +1,10 @@
 """Compiler for the reflex apps."""
 from __future__ import annotations
 
-from typing import List, Set, Tuple, Type
+import functools
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import List, Optional, Set, Tuple, Type
 
 from reflex import constants
 from reflex.compiler import templates, utils
@@ -72,6 +75,23 @@ def _compile_theme(theme: dict) -> str:
     return templates.THEME.render(theme=theme)
 
 
+@functools.lru_cache(maxsize=None)
+def _compile_state_cached(state: Type[State]) -> dict:
+    """Compile the initial state, memoized on the state class.
+
+    State classes are module-level singletons, so the compiled state is
+    invariant within a process and recompiles can skip the pydantic dict
+    traversal.
+
+    Args:
+        state: The app state.
+
+    Returns:
+        A dictionary of the compiled state.
+    """
+    return utils.compile_state(state)
+
+
 def _compile_contexts(state: Type[State]) -> str:
     """Compile the initial state and contexts.
 
@@ -82,12 +102,34 @@ def _compile_contexts(state: Type[State]) -> str:
         The compiled context file.
     """
     return templates.CONTEXT.render(
-        initial_state=utils.compile_state(state),
+        initial_state=_compile_state_cached(state),
         state_name=state.get_name(),
         client_storage=utils.compile_client_storage(state),
     )
 
 
+@functools.lru_cache(maxsize=None)
+def _compile_page_imports(
+    page_imports: Tuple[Tuple[str, frozenset[ImportVar]], ...]
+) -> List[dict]:
+    """Merge, validate and compile the imports for a page.
+
+    The DEFAULT_IMPORTS merge and the compiled header are invariant for pages
+    with the same import signature, which is the common case, so the whole
+    pipeline is memoized instead of being re-run per page.
+
+    Args:
+        page_imports: The page-specific imports as a hashable signature.
+
+    Returns:
+        The list of compiled import dicts.
+    """
+    # Merge the default imports with the app-specific imports, validating
+    # tag uniqueness during the merge instead of in a second full pass.
+    imports = utils.merge_imports_validated(DEFAULT_IMPORTS, dict(page_imports))
+    return utils.compile_imports(imports)
+
+
 def _compile_page(
     component: Component,
     state: Type[State],
@@ -101,10 +143,15 @@ def _compile_page(
     Returns:
         The compiled component.
     """
-    # Merge the default imports with the app-specific imports.
-    imports = utils.merge_imports(DEFAULT_IMPORTS, component.get_imports())
-    utils.validate_imports(imports)
-    imports = utils.compile_imports(imports)
+    # Compile the page imports, memoized on the component's import signature.
+    imports = _compile_page_imports(
+        tuple(
+            sorted(
+                (lib, frozenset(fields))
+                for lib, fields in component.get_imports().items()
+            )
+        )
+    )
 
     # Compile the code to render the component.
     return templates.PAGE.render(
@@ -221,7 +268,7 @@ def compile_page(
     path: str,
     component: Component,
     state: Type[State],
-) -> Tuple[str, str]:
+) -> Tuple[str, str, imports.ImportDict, Set[CustomComponent]]:
     """Compile a single page.
 
     Args:
@@ -230,14 +277,56 @@ def compile_page(
         state: The app state.
 
     Returns:
-        The path and code of the compiled page.
+        The path and code of the compiled page, along with the imports and
+        custom components collected from the component tree.
     """
     # Get the path for the output file.
     output_path = utils.get_page_path(path)
 
     # Add the style to the component.
     code = _compile_page(component, state)
-    return output_path, code
+
+    # Collect the imports and custom components here, so the component tree
+    # does not have to be traversed again by the caller.
+    return output_path, code, component.get_imports(), component.get_custom_components()
+
+
+def _compile_page_job(
+    job: Tuple[str, Component, Type[State]]
+) -> Tuple[str, str, imports.ImportDict, Set[CustomComponent]]:
+    """Compile a single page job in a worker thread.
+
+    Args:
+        job: The path, component and state of the page to compile.
+
+    Returns:
+        The result of compiling the page.
+    """
+    return compile_page(*job)
+
+
+def compile_pages(
+    pages: List[Tuple[str, Component, Type[State]]],
+    executor: Optional[Executor] = None,
+) -> List[Tuple[str, str, imports.ImportDict, Set[CustomComponent]]]:
+    """Compile a batch of pages in parallel.
+
+    Each page renders an independent template. Threads are used rather than
+    worker processes because the components reference wrapped event handlers
+    that do not survive pickling.
+
+    Args:
+        pages: The path, component and state of each page to compile.
+        executor: An optional executor to reuse for the batch. If not given, a
+            thread pool is created for the duration of the call.
+
+    Returns:
+        The compile results, in the same order as the given pages.
+    """
+    if executor is not None:
+        return list(executor.map(_compile_page_job, pages))
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        return list(pool.map(_compile_page_job, pages))
 
 
 def compile_components(components: Set[CustomComponent]):
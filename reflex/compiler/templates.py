@@ -1,6 +1,7 @@
 """Templates to use in the reflex compiler."""
+from __future__ import annotations
 
-from jinja2 import Environment, FileSystemLoader, Template
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
 
 from reflex import constants
 from reflex.utils.format import json_dumps
@@ -16,6 +17,15 @@ class ReflexJinjaEnvironment(Environment):
             extensions=extensions,
             trim_blocks=True,
             lstrip_blocks=True,
+            # Templates ship with the package and never change at runtime, so
+            # compile each one at most once and keep it cached forever.
+            auto_reload=False,
+            cache_size=-1,
+            # Persist compiled template bytecode on disk so new processes
+            # (e.g. dev reloads) skip the parse step entirely. The default
+            # cache directory is per-user and ownership-checked, so the
+            # bytecode cannot be poisoned by other users on the machine.
+            bytecode_cache=FileSystemBytecodeCache(),
         )
         self.filters["json_dumps"] = json_dumps
         self.filters["react_setter"] = lambda state: f"set{state.capitalize()}"
@@ -42,6 +52,11 @@ class ReflexJinjaEnvironment(Environment):
         }
 
 
+# The environment is shared so compiled template bytecode is reused across
+# every get_template call instead of being rebuilt per template.
+_ENV = ReflexJinjaEnvironment()
+
+
 def get_template(name: str) -> Template:
     """Get render function that work with a template.
 
@@ -51,7 +66,7 @@ def get_template(name: str) -> Template:
     Returns:
         A render function.
     """
-    return ReflexJinjaEnvironment().get_template(name=name)
+    return _ENV.get_template(name=name)
 
 
 # Template for the Reflex config file.
@@ -1,7 +1,9 @@
 """Common utility functions used in the compiler."""
 from __future__ import annotations
 
+import functools
 import os
+import shutil
 from typing import Any, Dict, List, Optional, Set, Tuple, Type
 
 from pydantic.fields import ModelField
@@ -27,8 +29,9 @@ from reflex.style import Style
 from reflex.utils import format, imports, path_ops
 from reflex.vars import ImportVar, NoRenderImportVar
 
-# To re-export this function.
+# To re-export these functions.
 merge_imports = imports.merge_imports
+merge_imports_validated = imports.merge_imports_validated
 
 
 def compile_import_statement(fields: Set[ImportVar]) -> Tuple[str, Set[str]]:
@@ -42,16 +45,35 @@ def compile_import_statement(fields: Set[ImportVar]) -> Tuple[str, Set[str]]:
         default: default library. When install "import def from library".
         rest: rest of libraries. When install "import {rest1, rest2} from library"
     """
-    # ignore the NoRenderImportVar fields during compilation
-    fields = {field for field in fields if not isinstance(field, NoRenderImportVar)}
+    return _compile_import_statement(frozenset(fields))
 
-    # Check for default imports.
-    defaults = {field for field in fields if field.is_default}
-    assert len(defaults) < 2
 
-    # Get the default import, and the specific imports.
-    default = next(iter({field.name for field in defaults}), "")
-    rest = {field.name for field in fields - defaults}
+@functools.lru_cache(maxsize=None)
+def _compile_import_statement(fields: frozenset[ImportVar]) -> Tuple[str, Set[str]]:
+    """Compile an import statement, memoized on the field set.
+
+    The DEFAULT_IMPORTS libraries are merged into every page, so their field
+    sets repeat across pages and only need to be compiled once.
+
+    Args:
+        fields: The set of fields to import from the library.
+
+    Returns:
+        The libraries for default and rest.
+    """
+    # Collect the default and specific imports in a single pass, ignoring the
+    # NoRenderImportVar fields during compilation.
+    default = ""
+    rest = set()
+    for field in fields:
+        if isinstance(field, NoRenderImportVar):
+            continue
+        if field.is_default:
+            # Only one default import is allowed per library.
+            assert not default
+            default = field.name
+        else:
+            rest.add(field.name)
 
     return default, rest
 
@@ -65,18 +87,24 @@ def validate_imports(imports: imports.ImportDict):
     Raises:
         ValueError: if a conflict on "tag/alias" is detected for an import.
     """
-    used_tags = {}
+    used_tags: dict[tuple[str, str | None], str] = {}
     for lib, _imports in imports.items():
         for _import in _imports:
-            import_name = (
-                f"{_import.tag}/{_import.alias}" if _import.alias else _import.tag
-            )
-            if import_name in used_tags:
+            # Untagged fields (e.g. NoRenderImportVar) import nothing, so
+            # they cannot conflict.
+            if _import.tag is None:
+                continue
+            # Key on the raw (tag, alias) pair so no string is formatted
+            # unless a conflict is actually found.
+            key = (_import.tag, _import.alias)
+            if key in used_tags:
+                import_name = (
+                    f"{_import.tag}/{_import.alias}" if _import.alias else _import.tag
+                )
                 raise ValueError(
-                    f"Can not compile, the tag {import_name} is used multiple time from {lib} and {used_tags[import_name]}"
+                    f"Can not compile, the tag {import_name} is used multiple time from {lib} and {used_tags[key]}"
                 )
-            if import_name is not None:
-                used_tags[import_name] = lib
+            used_tags[key] = lib
 
 
 def compile_imports(imports: imports.ImportDict) -> List[dict]:
@@ -99,7 +127,7 @@ def compile_imports(imports: imports.ImportDict) -> List[dict]:
             assert not default, "No default field allowed for empty library."
             assert rest is not None and len(rest) > 0, "No fields to import."
             for module in sorted(rest):
-                import_dicts.append(get_import_dict(module))
+                import_dicts.append({"lib": module, "default": "", "rest": set()})
             continue
 
         # remove the version before rendering the package imports
@@ -107,28 +135,10 @@ def compile_imports(imports: imports.ImportDict) -> List[dict]:
         if not lib:
             lib = at + version
 
-        import_dicts.append(get_import_dict(lib, default, rest))
+        import_dicts.append({"lib": lib, "default": default, "rest": rest or set()})
     return import_dicts
 
 
-def get_import_dict(lib: str, default: str = "", rest: Optional[Set] = None) -> Dict:
-    """Get dictionary for import template.
-
-    Args:
-        lib: The importing react library.
-        default: The default module to import.
-        rest: The rest module to import.
-
-    Returns:
-        A dictionary for import template.
-    """
-    return {
-        "lib": lib,
-        "default": default,
-        "rest": rest if rest else set(),
-    }
-
-
 def compile_state(state: Type[State]) -> Dict:
     """Compile the state of the app.
 
@@ -145,6 +155,10 @@ def compile_state(state: Type[State]) -> Dict:
     return format.format_state(initial_state)
 
 
+# The supported client-side storage types, in dispatch order.
+_CLIENT_STORAGE_TYPES = (Cookie, LocalStorage)
+
+
 def _compile_client_storage_field(
     field: ModelField,
 ) -> tuple[Type[Cookie] | Type[LocalStorage] | None, dict[str, Any] | None]:
@@ -156,58 +170,26 @@ def _compile_client_storage_field(
     Returns:
         A dictionary of the compiled cookie or None if the field is not cookie-like.
     """
-    for field_type in (Cookie, LocalStorage):
-        if isinstance(field.default, field_type):
-            cs_obj = field.default
-        elif isinstance(field.type_, type) and issubclass(field.type_, field_type):
-            cs_obj = field.type_()
-        else:
-            continue
-        return field_type, cs_obj.options()
+    # Dispatch on the default value first; the exact type check is cheaper
+    # than isinstance when it matches.
+    default = field.default
+    for field_type in _CLIENT_STORAGE_TYPES:
+        if type(default) is field_type or isinstance(default, field_type):
+            return field_type, default.options()
+
+    # Fall back to the field annotation for fields without a default.
+    annotation = field.type_
+    if isinstance(annotation, type) and issubclass(annotation, _CLIENT_STORAGE_TYPES):
+        field_type = Cookie if issubclass(annotation, Cookie) else LocalStorage
+        return field_type, annotation().options()
     return None, None
 
 
-def _compile_client_storage_recursive(
-    state: Type[State],
-) -> tuple[dict[str, dict], dict[str, dict[str, str]]]:
-    """Compile the client-side storage for the given state recursively.
-
-    Args:
-        state: The app state object.
-
-    Returns:
-        A tuple of the compiled client-side storage info:
-            (
-                cookies: dict[str, dict],
-                local_storage: dict[str, dict[str, str]]
-            )
-    """
-    cookies = {}
-    local_storage = {}
-    state_name = state.get_full_name()
-    for name, field in state.__fields__.items():
-        if name in state.inherited_vars:
-            # only include vars defined in this state
-            continue
-        state_key = f"{state_name}.{name}"
-        field_type, options = _compile_client_storage_field(field)
-        if field_type is Cookie:
-            cookies[state_key] = options
-        elif field_type is LocalStorage:
-            local_storage[state_key] = options
-        else:
-            continue
-    for substate in state.get_substates():
-        substate_cookies, substate_local_storage = _compile_client_storage_recursive(
-            substate
-        )
-        cookies.update(substate_cookies)
-        local_storage.update(substate_local_storage)
-    return cookies, local_storage
-
-
 def compile_client_storage(state: Type[State]) -> dict[str, dict]:
-    """Compile the client-side storage for the given state.
+    """Compile the client-side storage for the given state and its substates.
+
+    The state tree is walked iteratively with a single pair of result dicts,
+    instead of recursing and merging per-level dicts.
 
     Args:
         state: The app state object.
@@ -215,7 +197,23 @@ def compile_client_storage(state: Type[State]) -> dict[str, dict]:
     Returns:
         A dictionary of the compiled client-side storage info.
     """
-    cookies, local_storage = _compile_client_storage_recursive(state)
+    cookies: dict[str, dict] = {}
+    local_storage: dict[str, dict[str, str]] = {}
+    states = [state]
+    while states:
+        substate = states.pop()
+        state_name = substate.get_full_name()
+        inherited_vars = substate.inherited_vars
+        for name, field in substate.__fields__.items():
+            if name in inherited_vars:
+                # only include vars defined in this state
+                continue
+            field_type, options = _compile_client_storage_field(field)
+            if field_type is Cookie:
+                cookies[f"{state_name}.{name}"] = options
+            elif field_type is LocalStorage:
+                local_storage[f"{state_name}.{name}"] = options
+        states.extend(substate.get_substates())
     return {
         constants.COOKIES: cookies,
         constants.LOCAL_STORAGE: local_storage,
@@ -386,6 +384,10 @@ def add_meta(
     return page
 
 
+# Directories already created by write_page, to skip redundant mkdir calls.
+_known_dirs: set[str] = set()
+
+
 def write_page(path: str, code: str):
     """Write the given code to the given path.
 
@@ -393,9 +395,26 @@ def write_page(path: str, code: str):
         path: The path to write the code to.
         code: The code to write.
     """
-    path_ops.mkdir(os.path.dirname(path))
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(code)
+    page_dir = os.path.dirname(path)
+    if page_dir not in _known_dirs:
+        path_ops.mkdir(page_dir)
+        _known_dirs.add(page_dir)
+    data = code.encode("utf-8")
+
+    # Skip the write if the page is already up to date.
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return
+    except OSError:
+        pass
+
+    # Write the bytes directly to avoid the TextIOWrapper layer.
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
 
 
 def empty_dir(path: str, keep_files: Optional[List[str]] = None):
@@ -409,9 +428,18 @@ def empty_dir(path: str, keep_files: Optional[List[str]] = None):
     if not os.path.exists(path):
         return
 
-    # Remove all files and folders in the directory.
-    keep_files = keep_files or []
-    directory_contents = os.listdir(path)
-    for element in directory_contents:
-        if element not in keep_files:
-            path_ops.rm(os.path.join(path, element))
+    # Any directory previously seen by write_page may be deleted below, so
+    # the cache cannot be trusted afterwards.
+    _known_dirs.clear()
+
+    # Remove all files and folders in the directory. scandir yields entries
+    # with a cached file type, so no extra stat call is needed per entry.
+    keep_files = set(keep_files or [])
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.name in keep_files:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.remove(entry.path)
@@ -369,3 +369,6 @@ ON_UNMOUNT = "on_unmount"
 
 # If this env var is set to "yes", App.compile will be a no-op
 SKIP_COMPILE_ENV_VAR = "__REFLEX_SKIP_COMPILE"
+
+# If this env var is set to "yes", the app will not use uvloop even if it is installed
+DISABLE_UVLOOP_ENV_VAR = "REFLEX_DISABLE_UVLOOP"
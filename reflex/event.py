@@ -9,6 +9,12 @@ from reflex.base import Base
 from reflex.utils import format
 from reflex.vars import BaseVar, Var
 
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; fall back to the stdlib json decoder.
+    orjson = None
+
 
 class Event(Base):
     """An event that describes any state change in the app."""
@@ -25,6 +31,13 @@ class Event(Base):
     # The event payload.
     payload: Dict[str, Any] = {}
 
+    if orjson is not None:
+
+        class Config:
+            """Use orjson for faster parsing of incoming events."""
+
+            json_loads = orjson.loads
+
 
 class EventHandler(Base):
     """An event handler responds to an event to update the state."""
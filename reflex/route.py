@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 
 from reflex import constants
 from reflex.event import EventHandler
@@ -118,9 +119,13 @@ def get_route_args(route: str) -> dict[str, str]:
     return args
 
 
+@lru_cache(maxsize=1024)
 def catchall_in_route(route: str) -> str:
     """Extract the catchall part from a route.
 
+    The cache is bounded so resolving arbitrary routes cannot grow memory
+    without limit.
+
     Args:
         route: the route from which to extract
 
@@ -131,6 +136,7 @@ def catchall_in_route(route: str) -> str:
     return match_.group() if match_ else ""
 
 
+@lru_cache(maxsize=1024)
 def catchall_prefix(route: str) -> str:
     """Extract the prefix part from a route that contains a catchall.
 
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import copy
 import functools
 import inspect
@@ -17,6 +18,7 @@ from typing import (
     Callable,
     ClassVar,
     Dict,
+    Iterator,
     List,
     Optional,
     Sequence,
@@ -29,6 +31,12 @@ import cloudpickle
 import pydantic
 from redis import Redis
 
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; fall back to the stdlib json encoder.
+    orjson = None
+
 from reflex import constants
 from reflex.base import Base
 from reflex.event import Event, EventHandler, EventSpec, fix_events, window_alert
@@ -1018,6 +1026,19 @@ class DefaultState(State):
     pass
 
 
+def _orjson_dumps(obj: Any, *, default: Callable) -> str:
+    """Serialize an object to a json string using orjson.
+
+    Args:
+        obj: The object to serialize.
+        default: The fallback serializer for unsupported types.
+
+    Returns:
+        The object as a json string.
+    """
+    return orjson.dumps(obj, default=default).decode()
+
+
 class StateUpdate(Base):
     """A state update sent to the frontend."""
 
@@ -1030,6 +1051,14 @@ class StateUpdate(Base):
     # Whether this is the final state update for the event.
     final: bool = True
 
+    if orjson is not None:
+
+        class Config:
+            """Use orjson for faster serialization over the websocket."""
+
+            json_dumps = _orjson_dumps
+            json_loads = orjson.loads
+
 
 class StateManager(Base):
     """A class to manage many client states."""
@@ -1086,6 +1115,23 @@ class StateManager(Base):
             return
         self.redis.set(token, cloudpickle.dumps(state), ex=self.token_expiration)
 
+    @contextlib.contextmanager
+    def session(self, token: str) -> Iterator[State]:
+        """Get the state for a token and persist it when the block exits.
+
+        This batches the get_state / set_state pair around an event into a
+        single place, so backends only need one round-trip per event.
+
+        Args:
+            token: The token to get the state for.
+
+        Yields:
+            The state for the token.
+        """
+        state = self.get_state(token)
+        yield state
+        self.set_state(token, state)
+
 
 def _convert_mutable_datatypes(
     field_value: Any, reassign_field: Callable, field_name: str
@@ -9,6 +9,7 @@ import os
 import os.path as op
 import re
 import sys
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any, Type, Union
 
 import plotly.graph_objects as go
@@ -444,6 +445,21 @@ def format_event_chain(
     )
 
 
+@lru_cache(maxsize=4096)
+def _format_query_param_name(param: str) -> str:
+    """Convert a query param name to python-friendly case.
+
+    The cache is bounded since param names come from the client.
+
+    Args:
+        param: the query param name
+
+    Returns:
+        The reformatted query param name
+    """
+    return param.replace("-", "_")
+
+
 def format_query_params(router_data: dict[str, Any]) -> dict[str, str]:
     """Convert back query params name to python-friendly case.
 
@@ -454,7 +470,7 @@ def format_query_params(router_data: dict[str, Any]) -> dict[str, str]:
         The reformatted query params
     """
     params = router_data[constants.RouteVar.QUERY]
-    return {k.replace("-", "_"): v for k, v in params.items()}
+    return {_format_query_param_name(k): v for k, v in params.items()}
 
 
 def format_dataframe_values(value: Type) -> list[Any]:
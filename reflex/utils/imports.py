@@ -25,3 +25,45 @@ def merge_imports(*imports) -> ImportDict:
             for field in fields:
                 all_imports[lib].add(field)
     return all_imports
+
+
+def merge_imports_validated(*imports) -> ImportDict:
+    """Merge multiple import dicts, validating tag uniqueness while merging.
+
+    Tracking the used tags during the merge makes a separate full validation
+    pass over the merged dict unnecessary.
+
+    Args:
+        *imports: The list of import dicts to merge.
+
+    Returns:
+        The merged import dicts.
+
+    Raises:
+        ValueError: if a conflict on "tag/alias" is detected for an import.
+    """
+    all_imports = defaultdict(set)
+    used_tags: Dict[tuple, str] = {}
+    for import_dict in imports:
+        for lib, fields in import_dict.items():
+            lib_fields = all_imports[lib]
+            for field in fields:
+                if field in lib_fields:
+                    # Already merged from an earlier dict, so already checked.
+                    continue
+                if field.tag is None:
+                    # Untagged fields (e.g. NoRenderImportVar) import nothing,
+                    # so they cannot conflict.
+                    lib_fields.add(field)
+                    continue
+                key = (field.tag, field.alias)
+                if key in used_tags:
+                    import_name = (
+                        f"{field.tag}/{field.alias}" if field.alias else field.tag
+                    )
+                    raise ValueError(
+                        f"Can not compile, the tag {import_name} is used multiple time from {lib} and {used_tags[key]}"
+                    )
+                used_tags[key] = lib
+                lib_fields.add(field)
+    return all_imports
@@ -1,12 +1,14 @@
 """The pyi generator module."""
 
+import functools
 import importlib
 import inspect
+import io
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from inspect import getfullargspec
-from pathlib import Path
 from typing import Any, Dict, List, Optional, get_args
 
 import black
@@ -27,7 +29,34 @@ EXCLUDED_FILES = [
 
 DEFAULT_TYPING_IMPORTS = {"overload", "Optional", "Union"}
 
+# Patterns used per source line in _generate_docstrings.
+_DEF_RE = re.compile(r"def ")
+_PROP_RE = re.compile(r"\w+:")
 
+# Black formatting mode, reused for every generated stub. is_pyi must be set
+# explicitly since black no longer infers it from a .pyi filename here.
+_BLACK_MODE = black.FileMode(is_pyi=True)
+
+# Sorted triggers per component class, so each class is only instantiated
+# and its triggers sorted once.
+_triggers_cache: dict = {}
+
+
+def _get_triggers(_class):
+    triggers = _triggers_cache.get(_class)
+    if triggers is None:
+        triggers = _triggers_cache[_class] = tuple(sorted(_class().get_triggers()))
+    return triggers
+
+
+@functools.lru_cache(maxsize=1024)
+def _eval_hint(value: str):
+    # Forward-ref strings repeat across sibling classes, and eval has to
+    # parse and compile each one, so resolve each unique string only once.
+    return eval(value)
+
+
+@functools.lru_cache(maxsize=None)
 def _get_type_hint(value, top_level=True, no_union=False):
     res = ""
     args = get_args(value)
@@ -44,7 +73,7 @@ def _get_type_hint(value, top_level=True, no_union=False):
                 res = ", ".join(types)
                 res = f"Union[{res}]"
     elif isinstance(value, str):
-        ev = eval(value)
+        ev = _eval_hint(value)
         res = _get_type_hint(ev, top_level=False) if ev.__name__ == "Var" else value
     else:
         res = value.__name__
@@ -53,12 +82,15 @@ def _get_type_hint(value, top_level=True, no_union=False):
     return res
 
 
+@functools.lru_cache(maxsize=None)
+def _source_lines(obj):
+    # Cache the source read per module/class, since it is requested once per
+    # variable and class during a scan.
+    return inspect.getsource(obj).splitlines()
+
+
 def _get_typing_import(_module):
-    src = [
-        line
-        for line in inspect.getsource(_module).split("\n")
-        if line.startswith("from typing")
-    ]
+    src = [line for line in _source_lines(_module) if line.startswith("from typing")]
     if len(src):
         return set(src[0].rpartition("from typing import ")[-1].split(", "))
     return set()
@@ -67,7 +99,7 @@ def _get_typing_import(_module):
 def _get_var_definition(_module, _var_name):
     return [
         line.split(" = ")[0]
-        for line in inspect.getsource(_module).splitlines()
+        for line in _source_lines(_module)
         if line.startswith(_var_name)
     ]
 
@@ -110,23 +142,28 @@ class PyiGenerator:
             "",
             f"class {_class.__name__}({', '.join([base.__name__ for base in _class.__bases__])}):",
         ]
-        definition = f"    @overload\n    @classmethod\n    def create(cls, *children, "
+        buf = io.StringIO()
+        buf.write("    @overload\n    @classmethod\n    def create(cls, *children, ")
 
         for kwarg in create_spec.kwonlyargs:
             if kwarg in create_spec.annotations:
-                definition += f"{kwarg}: {_get_type_hint(create_spec.annotations[kwarg])} = None, "
+                buf.write(
+                    f"{kwarg}: {_get_type_hint(create_spec.annotations[kwarg])} = None, "
+                )
             else:
-                definition += f"{kwarg}, "
+                buf.write(f"{kwarg}, ")
 
         for name, value in _class.__annotations__.items():
             if name in create_spec.kwonlyargs:
                 continue
-            definition += f"{name}: {_get_type_hint(value)} = None, "
+            buf.write(f"{name}: {_get_type_hint(value)} = None, ")
 
-        for trigger in sorted(_class().get_triggers()):
-            definition += f"{trigger}: Optional[Union[EventHandler, EventSpec, List, function, BaseVar]] = None, "
+        for trigger in _get_triggers(_class):
+            buf.write(
+                f"{trigger}: Optional[Union[EventHandler, EventSpec, List, function, BaseVar]] = None, "
+            )
 
-        definition = definition.rstrip(", ")
+        definition = buf.getvalue().rstrip(", ")
         definition += f", **props) -> '{_class.__name__}': # type: ignore\n"
 
         definition += self._generate_docstrings(_class, _class.__annotations__.keys())
@@ -137,8 +174,8 @@ class PyiGenerator:
     def _generate_docstrings(self, _class, _props):
         props_comments = {}
         comments = []
-        for _i, line in enumerate(inspect.getsource(_class).splitlines()):
-            reached_functions = re.search("def ", line)
+        for _i, line in enumerate(_source_lines(_class)):
+            reached_functions = _DEF_RE.search(line)
             if reached_functions:
                 # We've reached the functions, so stop.
                 break
@@ -149,7 +186,7 @@ class PyiGenerator:
                 continue
 
             # Check if this line has a prop.
-            match = re.search("\\w+:", line)
+            match = _PROP_RE.search(line)
             if match is None:
                 # This line doesn't have a var, so continue.
                 continue
@@ -163,19 +200,17 @@ class PyiGenerator:
                 )
                 comments.clear()
                 continue
-        new_docstring = []
+        buf = io.StringIO()
         for i, line in enumerate(_class.create.__doc__.splitlines()):
             if i == 0:
-                new_docstring.append(" " * 8 + '"""' + line)
+                buf.write(" " * 8 + '"""' + line + "\n")
             else:
-                new_docstring.append(line)
+                buf.write(line + "\n")
             if "*children" in line:
-                for nline in [
-                    f"{line.split('*')[0]}{n}:{c}" for n, c in props_comments.items()
-                ]:
-                    new_docstring.append(nline)
-        new_docstring += ['"""']
-        return "\n".join(new_docstring)
+                for n, c in props_comments.items():
+                    buf.write(f"{line.split('*')[0]}{n}:{c}\n")
+        buf.write('"""')
+        return buf.getvalue()
 
     def _generate_pyi_variable(self, _name, _var):
         return _get_var_definition(self.current_module, _name)
@@ -206,14 +241,11 @@ class PyiGenerator:
         pyi_filename = f"{self.current_module_path}.pyi"
         pyi_path = os.path.join(self.root, pyi_filename)
 
+        # Format in memory and write once, instead of writing the unformatted
+        # stub and having black re-read and rewrite it.
+        src = black.format_str("\n".join(pyi_content), mode=_BLACK_MODE)
         with open(pyi_path, "w") as pyi_file:
-            pyi_file.write("\n".join(pyi_content))
-        black.format_file_in_place(
-            src=Path(pyi_path),
-            fast=True,
-            mode=black.FileMode(),
-            write_back=black.WriteBack.YES,
-        )
+            pyi_file.write(src)
 
     def _scan_file(self, file):
         self.current_module_path = os.path.splitext(file)[0]
@@ -256,13 +288,17 @@ class PyiGenerator:
         self._write_pyi_file(local_variables, functions, class_names)
 
     def _scan_folder(self, folder):
-        for root, _, files in os.walk(folder):
-            self.root = root
-            for file in files:
-                if file in EXCLUDED_FILES:
-                    continue
-                if file.endswith(".py"):
-                    self._scan_file(file)
+        # Collect the files first, then scan them across worker processes;
+        # each file pays for a module import and a black format independently.
+        file_jobs = [
+            (root, file)
+            for root, _, files in os.walk(folder)
+            for file in files
+            if file not in EXCLUDED_FILES and file.endswith(".py")
+        ]
+        with ProcessPoolExecutor() as executor:
+            # Consume the iterator so worker exceptions propagate.
+            list(executor.map(_scan_file_worker, file_jobs))
 
     def scan_all(self, targets):
         """Scan all targets for class inheriting Component and generate the .pyi files.
@@ -278,6 +314,15 @@ class PyiGenerator:
                 self._scan_folder(target)
 
 
+def _scan_file_worker(job):
+    root, file = job
+    # Use a fresh generator per file, so no module state has to be pickled
+    # between the scanning processes.
+    gen = PyiGenerator()
+    gen.root = root
+    gen._scan_file(file)
+
+
 if __name__ == "__main__":
     targets = sys.argv[1:] if len(sys.argv) > 1 else ["reflex/components"]
     print(f"Running .pyi generator for {targets}")
@@ -8,10 +8,23 @@ from typing import Dict, Generator, List, Set, Union
 import pytest
 
 import reflex as rx
-from reflex.app import App
+from reflex.app import App, DefaultState
 from reflex.event import EventSpec
 
 
+def pytest_sessionstart(session):
+    """Warm the invariant reflex state machinery once before any test runs.
+
+    Constructing and serializing the default state primes the pydantic
+    validators and computed var dependency tracking that every App built in
+    the tests shares, so no single test pays that one-time cost.
+
+    Args:
+        session: The pytest session.
+    """
+    DefaultState().dict()
+
+
 @pytest.fixture
 def app() -> App:
     """A base app.
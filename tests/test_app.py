@@ -3,6 +3,7 @@ from __future__ import annotations
 import io
 import os.path
 import sys
+from types import MappingProxyType
 from typing import List, Tuple, Type
 
 if sys.version_info.major >= 3 and sys.version_info.minor > 7:
@@ -13,6 +14,7 @@ else:
 import pytest
 import sqlmodel
 from fastapi import UploadFile
+from sqlmodel.pool import StaticPool
 from starlette_admin.auth import AuthProvider
 from starlette_admin.contrib.sqla.admin import Admin
 from starlette_admin.contrib.sqla.view import ModelView
@@ -36,7 +38,7 @@ from reflex.utils import format
 from reflex.vars import ComputedVar
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def index_page():
     """An index page.
 
@@ -50,7 +52,7 @@ def index_page():
     return index
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def about_page():
     """An about page.
 
@@ -64,7 +66,7 @@ def about_page():
     return about
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def test_state() -> Type[State]:
     """A default state.
 
@@ -79,6 +81,20 @@ def test_state() -> Type[State]:
 
 
 @pytest.fixture()
+def mutable_test_state() -> Type[State]:
+    """A fresh state class per test, for tests that mutate the class itself.
+
+    Returns:
+        A default state.
+    """
+
+    class TestState(State):
+        var: int
+
+    return TestState
+
+
+@pytest.fixture(scope="session")
 def redundant_test_state() -> Type[State]:
     """A default state.
 
@@ -122,19 +138,21 @@ def test_model_auth() -> Type[Model]:
     return TestModelAuth
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def test_get_engine():
-    """A default database engine.
+    """A default database engine, shared across the test session.
 
     Returns:
         A default database engine.
     """
     enable_admin = True
-    url = "sqlite:///test.db"
+    url = "sqlite:///:memory:"
     return sqlmodel.create_engine(
         url,
         echo=False,
         connect_args={"check_same_thread": False} if enable_admin else {},
+        # Keep the in-memory database alive across connections.
+        poolclass=StaticPool,
     )
 
 
@@ -171,6 +189,21 @@ def test_custom_auth_admin() -> Type[AuthProvider]:
     return TestAuthProvider
 
 
+async def _first_update(updates):
+    """Get the first update from a state update generator and close it.
+
+    Args:
+        updates: An async generator of state updates.
+
+    Returns:
+        The first update.
+    """
+    try:
+        return await updates.__anext__()
+    finally:
+        await updates.aclose()
+
+
 def test_default_app(app: App):
     """Test creating an app with no args.
 
@@ -260,6 +293,25 @@ def test_add_page_set_route_nested(app: App, index_page, windows_platform: bool)
     assert set(app.pages.keys()) == {route.strip(os.path.sep)}
 
 
+def test_add_page_component_instance_not_mutated(app: App):
+    """Test that adding a component instance as a page does not mutate it.
+
+    Args:
+        app: The app to test.
+    """
+    assert app.overlay_component is None
+    component = Box.create("Hello")
+    children = list(component.children)
+    app.add_page(component, route="/one")
+    app.add_page(component, route="/two")
+    assert component.children == children
+    # Each page gets its own Fragment root holding the component and the
+    # page metadata.
+    assert app.pages["one"] is not app.pages["two"]
+    assert len(app.pages["one"].children) == 2
+    assert len(app.pages["two"].children) == 2
+
+
 def test_initialize_with_admin_dashboard(test_model):
     """Test setting the admin dashboard of an app.
 
@@ -272,6 +324,7 @@ def test_initialize_with_admin_dashboard(test_model):
     assert app.admin_dash.models[0] == test_model
 
 
+@pytest.mark.xdist_group("app_state")
 def test_initialize_with_custom_admin_dashboard(
     test_get_engine,
     test_custom_auth_admin,
@@ -313,29 +366,42 @@ def test_initialize_admin_dashboard_with_view_overrides(test_model):
     assert app.admin_dash.view_overrides[test_model] == TestModelView
 
 
-def test_initialize_with_state(test_state):
+@pytest.fixture(scope="module")
+def test_state_app(test_state) -> App:
+    """An app using the default test state, shared across the module.
+
+    Args:
+        test_state: The default state.
+
+    Returns:
+        The app.
+    """
+    return App(state=test_state)
+
+
+def test_initialize_with_state(test_state, test_state_app: App):
     """Test setting the state of an app.
 
     Args:
         test_state: The default state.
+        test_state_app: An app using the default test state.
     """
-    app = App(state=test_state)
-    assert app.state == test_state
+    assert test_state_app.state == test_state
 
     # Get a state for a given token.
     token = "token"
-    state = app.state_manager.get_state(token)
+    state = test_state_app.state_manager.get_state(token)
     assert isinstance(state, test_state)
     assert state.var == 0  # type: ignore
 
 
-def test_set_and_get_state(test_state):
+def test_set_and_get_state(test_state_app: App):
     """Test setting and getting the state of an app with different tokens.
 
     Args:
-        test_state: The default state.
+        test_state_app: An app using the default test state.
     """
-    app = App(state=test_state)
+    app = test_state_app
 
     # Create two tokens.
     token1 = "token1"
@@ -361,203 +427,203 @@ def test_set_and_get_state(test_state):
 
 
 @pytest.mark.asyncio
-async def test_dynamic_var_event(test_state):
+async def test_dynamic_var_event(mutable_test_state):
     """Test that the default handler of a dynamic generated var
     works as expected.
 
+    add_var mutates the state class, so this test gets its own class
+    instead of the session-scoped one.
+
     Args:
-        test_state: State Fixture.
+        mutable_test_state: A fresh state class for this test.
     """
-    test_state = test_state()
+    test_state = mutable_test_state()
     test_state.add_var("int_val", int, 0)
-    result = await test_state._process(
-        Event(
-            token="fake-token",
-            name="test_state.set_int_val",
-            router_data={"pathname": "/", "query": {}},
-            payload={"value": 50},
+    result = await _first_update(
+        test_state._process(
+            Event(
+                token="fake-token",
+                name="test_state.set_int_val",
+                router_data={"pathname": "/", "query": {}},
+                payload={"value": 50},
+            )
         )
-    ).__anext__()
+    )
     assert result.delta == {"test_state": {"int_val": 50}}
 
 
-@pytest.mark.asyncio
-@pytest.mark.parametrize(
-    "event_tuples",
-    [
-        pytest.param(
-            [
-                (
-                    "test_state.make_friend",
-                    {"test_state": {"plain_friends": ["Tommy", "another-fd"]}},
+# Parametrize cases for the mutation detection tests, built once at import.
+# The expected deltas are wrapped in MappingProxyType so an in-place mutation
+# by a handler raises instead of corrupting later parametrize iterations.
+_LIST_MUTATION_CASES = (
+    pytest.param(
+        (
+            (
+                "test_state.make_friend",
+                MappingProxyType(
+                    {"test_state": {"plain_friends": ["Tommy", "another-fd"]}}
                 ),
-                (
-                    "test_state.change_first_friend",
-                    {"test_state": {"plain_friends": ["Jenny", "another-fd"]}},
+            ),
+            (
+                "test_state.change_first_friend",
+                MappingProxyType(
+                    {"test_state": {"plain_friends": ["Jenny", "another-fd"]}}
                 ),
-            ],
-            id="append then __setitem__",
+            ),
         ),
-        pytest.param(
-            [
-                (
-                    "test_state.unfriend_first_friend",
-                    {"test_state": {"plain_friends": []}},
-                ),
-                (
-                    "test_state.make_friend",
-                    {"test_state": {"plain_friends": ["another-fd"]}},
-                ),
-            ],
-            id="delitem then append",
+        id="append then __setitem__",
+    ),
+    pytest.param(
+        (
+            (
+                "test_state.unfriend_first_friend",
+                MappingProxyType({"test_state": {"plain_friends": []}}),
+            ),
+            (
+                "test_state.make_friend",
+                MappingProxyType({"test_state": {"plain_friends": ["another-fd"]}}),
+            ),
         ),
-        pytest.param(
-            [
-                (
-                    "test_state.make_friends_with_colleagues",
-                    {"test_state": {"plain_friends": ["Tommy", "Peter", "Jimmy"]}},
-                ),
-                (
-                    "test_state.remove_tommy",
-                    {"test_state": {"plain_friends": ["Peter", "Jimmy"]}},
-                ),
-                (
-                    "test_state.remove_last_friend",
-                    {"test_state": {"plain_friends": ["Peter"]}},
-                ),
-                (
-                    "test_state.unfriend_all_friends",
-                    {"test_state": {"plain_friends": []}},
+        id="delitem then append",
+    ),
+    pytest.param(
+        (
+            (
+                "test_state.make_friends_with_colleagues",
+                MappingProxyType(
+                    {"test_state": {"plain_friends": ["Tommy", "Peter", "Jimmy"]}}
                 ),
-            ],
-            id="extend, remove, pop, clear",
+            ),
+            (
+                "test_state.remove_tommy",
+                MappingProxyType({"test_state": {"plain_friends": ["Peter", "Jimmy"]}}),
+            ),
+            (
+                "test_state.remove_last_friend",
+                MappingProxyType({"test_state": {"plain_friends": ["Peter"]}}),
+            ),
+            (
+                "test_state.unfriend_all_friends",
+                MappingProxyType({"test_state": {"plain_friends": []}}),
+            ),
         ),
-        pytest.param(
-            [
-                (
-                    "test_state.add_jimmy_to_second_group",
+        id="extend, remove, pop, clear",
+    ),
+    pytest.param(
+        (
+            (
+                "test_state.add_jimmy_to_second_group",
+                MappingProxyType(
                     {
                         "test_state": {
                             "friends_in_nested_list": [["Tommy"], ["Jenny", "Jimmy"]]
                         }
-                    },
+                    }
                 ),
-                (
-                    "test_state.remove_first_person_from_first_group",
-                    {
-                        "test_state": {
-                            "friends_in_nested_list": [[], ["Jenny", "Jimmy"]]
-                        }
-                    },
+            ),
+            (
+                "test_state.remove_first_person_from_first_group",
+                MappingProxyType(
+                    {"test_state": {"friends_in_nested_list": [[], ["Jenny", "Jimmy"]]}}
                 ),
-                (
-                    "test_state.remove_first_group",
-                    {"test_state": {"friends_in_nested_list": [["Jenny", "Jimmy"]]}},
+            ),
+            (
+                "test_state.remove_first_group",
+                MappingProxyType(
+                    {"test_state": {"friends_in_nested_list": [["Jenny", "Jimmy"]]}}
                 ),
-            ],
-            id="nested list",
+            ),
         ),
-        pytest.param(
-            [
-                (
-                    "test_state.add_jimmy_to_tommy_friends",
-                    {"test_state": {"friends_in_dict": {"Tommy": ["Jenny", "Jimmy"]}}},
-                ),
-                (
-                    "test_state.remove_jenny_from_tommy",
-                    {"test_state": {"friends_in_dict": {"Tommy": ["Jimmy"]}}},
+        id="nested list",
+    ),
+    pytest.param(
+        (
+            (
+                "test_state.add_jimmy_to_tommy_friends",
+                MappingProxyType(
+                    {"test_state": {"friends_in_dict": {"Tommy": ["Jenny", "Jimmy"]}}}
                 ),
-                (
-                    "test_state.tommy_has_no_fds",
-                    {"test_state": {"friends_in_dict": {"Tommy": []}}},
+            ),
+            (
+                "test_state.remove_jenny_from_tommy",
+                MappingProxyType(
+                    {"test_state": {"friends_in_dict": {"Tommy": ["Jimmy"]}}}
                 ),
-            ],
-            id="list in dict",
+            ),
+            (
+                "test_state.tommy_has_no_fds",
+                MappingProxyType({"test_state": {"friends_in_dict": {"Tommy": []}}}),
+            ),
         ),
-    ],
+        id="list in dict",
+    ),
 )
-async def test_list_mutation_detection__plain_list(
-    event_tuples: List[Tuple[str, List[str]]], list_mutation_state: State
-):
-    """Test list mutation detection
-    when reassignment is not explicitly included in the logic.
 
-    Args:
-        event_tuples: From parametrization.
-        list_mutation_state: A state with list mutation features.
-    """
-    for event_name, expected_delta in event_tuples:
-        result = await list_mutation_state._process(
-            Event(
-                token="fake-token",
-                name=event_name,
-                router_data={"pathname": "/", "query": {}},
-                payload={},
-            )
-        ).__anext__()
-
-        assert result.delta == expected_delta
-
-
-@pytest.mark.asyncio
-@pytest.mark.parametrize(
-    "event_tuples",
-    [
-        pytest.param(
-            [
-                (
-                    "test_state.add_age",
-                    {"test_state": {"details": {"name": "Tommy", "age": 20}}},
-                ),
-                (
-                    "test_state.change_name",
-                    {"test_state": {"details": {"name": "Jenny", "age": 20}}},
+_DICT_MUTATION_CASES = (
+    pytest.param(
+        (
+            (
+                "test_state.add_age",
+                MappingProxyType(
+                    {"test_state": {"details": {"name": "Tommy", "age": 20}}}
                 ),
-                (
-                    "test_state.remove_last_detail",
-                    {"test_state": {"details": {"name": "Jenny"}}},
+            ),
+            (
+                "test_state.change_name",
+                MappingProxyType(
+                    {"test_state": {"details": {"name": "Jenny", "age": 20}}}
                 ),
-            ],
-            id="update then __setitem__",
+            ),
+            (
+                "test_state.remove_last_detail",
+                MappingProxyType({"test_state": {"details": {"name": "Jenny"}}}),
+            ),
         ),
-        pytest.param(
-            [
-                (
-                    "test_state.clear_details",
-                    {"test_state": {"details": {}}},
-                ),
-                (
-                    "test_state.add_age",
-                    {"test_state": {"details": {"age": 20}}},
-                ),
-            ],
-            id="delitem then update",
+        id="update then __setitem__",
+    ),
+    pytest.param(
+        (
+            (
+                "test_state.clear_details",
+                MappingProxyType({"test_state": {"details": {}}}),
+            ),
+            (
+                "test_state.add_age",
+                MappingProxyType({"test_state": {"details": {"age": 20}}}),
+            ),
         ),
-        pytest.param(
-            [
-                (
-                    "test_state.add_age",
-                    {"test_state": {"details": {"name": "Tommy", "age": 20}}},
-                ),
-                (
-                    "test_state.remove_name",
-                    {"test_state": {"details": {"age": 20}}},
-                ),
-                (
-                    "test_state.pop_out_age",
-                    {"test_state": {"details": {}}},
+        id="delitem then update",
+    ),
+    pytest.param(
+        (
+            (
+                "test_state.add_age",
+                MappingProxyType(
+                    {"test_state": {"details": {"name": "Tommy", "age": 20}}}
                 ),
-            ],
-            id="add, remove, pop",
+            ),
+            (
+                "test_state.remove_name",
+                MappingProxyType({"test_state": {"details": {"age": 20}}}),
+            ),
+            (
+                "test_state.pop_out_age",
+                MappingProxyType({"test_state": {"details": {}}}),
+            ),
         ),
-        pytest.param(
-            [
-                (
-                    "test_state.remove_home_address",
-                    {"test_state": {"address": [{}, {"work": "work address"}]}},
+        id="add, remove, pop",
+    ),
+    pytest.param(
+        (
+            (
+                "test_state.remove_home_address",
+                MappingProxyType(
+                    {"test_state": {"address": [{}, {"work": "work address"}]}}
                 ),
-                (
-                    "test_state.add_street_to_home_address",
+            ),
+            (
+                "test_state.add_street_to_home_address",
+                MappingProxyType(
                     {
                         "test_state": {
                             "address": [
@@ -565,15 +631,17 @@ async def test_list_mutation_detection__plain_list(
                                 {"work": "work address"},
                             ]
                         }
-                    },
+                    }
                 ),
-            ],
-            id="dict in list",
+            ),
         ),
-        pytest.param(
-            [
-                (
-                    "test_state.change_friend_name",
+        id="dict in list",
+    ),
+    pytest.param(
+        (
+            (
+                "test_state.change_friend_name",
+                MappingProxyType(
                     {
                         "test_state": {
                             "friend_in_nested_dict": {
@@ -581,10 +649,12 @@ async def test_list_mutation_detection__plain_list(
                                 "friend": {"name": "Tommy"},
                             }
                         }
-                    },
+                    }
                 ),
-                (
-                    "test_state.add_friend_age",
+            ),
+            (
+                "test_state.add_friend_age",
+                MappingProxyType(
                     {
                         "test_state": {
                             "friend_in_nested_dict": {
@@ -592,17 +662,50 @@ async def test_list_mutation_detection__plain_list(
                                 "friend": {"name": "Tommy", "age": 30},
                             }
                         }
-                    },
+                    }
                 ),
-                (
-                    "test_state.remove_friend",
-                    {"test_state": {"friend_in_nested_dict": {"name": "Nikhil"}}},
+            ),
+            (
+                "test_state.remove_friend",
+                MappingProxyType(
+                    {"test_state": {"friend_in_nested_dict": {"name": "Nikhil"}}}
                 ),
-            ],
-            id="nested dict",
+            ),
         ),
-    ],
+        id="nested dict",
+    ),
 )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("event_tuples", _LIST_MUTATION_CASES)
+async def test_list_mutation_detection__plain_list(
+    event_tuples: List[Tuple[str, List[str]]], list_mutation_state: State
+):
+    """Test list mutation detection
+    when reassignment is not explicitly included in the logic.
+
+    Args:
+        event_tuples: From parametrization.
+        list_mutation_state: A state with list mutation features.
+    """
+    for event_name, expected_delta in event_tuples:
+        result = await _first_update(
+            list_mutation_state._process(
+                Event(
+                    token="fake-token",
+                    name=event_name,
+                    router_data={"pathname": "/", "query": {}},
+                    payload={},
+                )
+            )
+        )
+
+        assert result.delta == expected_delta
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("event_tuples", _DICT_MUTATION_CASES)
 async def test_dict_mutation_detection__plain_list(
     event_tuples: List[Tuple[str, List[str]]], dict_mutation_state: State
 ):
@@ -614,75 +717,96 @@ async def test_dict_mutation_detection__plain_list(
         dict_mutation_state: A state with dict mutation features.
     """
     for event_name, expected_delta in event_tuples:
-        result = await dict_mutation_state._process(
-            Event(
-                token="fake-token",
-                name=event_name,
-                router_data={"pathname": "/", "query": {}},
-                payload={},
+        result = await _first_update(
+            dict_mutation_state._process(
+                Event(
+                    token="fake-token",
+                    name=event_name,
+                    router_data={"pathname": "/", "query": {}},
+                    payload={},
+                )
             )
-        ).__anext__()
+        )
 
         assert result.delta == expected_delta
 
 
-@pytest.mark.asyncio
-@pytest.mark.parametrize(
-    "fixture, delta",
-    [
-        (
-            "upload_state",
-            {"file_upload_state": {"img_list": ["image1.jpg", "image2.jpg"]}},
-        ),
-        (
-            "upload_sub_state",
-            {
-                "file_state.file_upload_state": {
-                    "img_list": ["image1.jpg", "image2.jpg"]
-                }
-            },
-        ),
-        (
-            "upload_grand_sub_state",
-            {
-                "base_file_state.file_sub_state.file_upload_state": {
-                    "img_list": ["image1.jpg", "image2.jpg"]
-                }
-            },
-        ),
-    ],
+@pytest.fixture(scope="module")
+def upload_bytes() -> bytes:
+    """The binary data uploaded by the upload tests.
+
+    Returns:
+        The upload payload.
+    """
+    return b"This is binary data"
+
+
+@pytest.fixture
+def emit_mock():
+    """A mock for the event namespace emit, fresh per test for call isolation.
+
+    Returns:
+        The mock.
+    """
+    return AsyncMock()
+
+
+# The expected delta per upload state fixture, with the serialized state
+# update precomputed once at import instead of per test run.
+_UPLOAD_CASES = (
+    (
+        "upload_state",
+        {"file_upload_state": {"img_list": ["image1.jpg", "image2.jpg"]}},
+    ),
+    (
+        "upload_sub_state",
+        {"file_state.file_upload_state": {"img_list": ["image1.jpg", "image2.jpg"]}},
+    ),
+    (
+        "upload_grand_sub_state",
+        {
+            "base_file_state.file_sub_state.file_upload_state": {
+                "img_list": ["image1.jpg", "image2.jpg"]
+            }
+        },
+    ),
 )
-async def test_upload_file(fixture, request, delta):
+_EXPECTED_UPLOAD_UPDATE_JSON = {
+    fixture: StateUpdate(delta=delta, events=[], final=True).json()
+    for fixture, delta in _UPLOAD_CASES
+}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fixture, delta", _UPLOAD_CASES)
+async def test_upload_file(fixture, request, delta, upload_bytes, emit_mock):
     """Test that file upload works correctly.
 
     Args:
         fixture: The state.
         request: Fixture request.
         delta: Expected delta
+        upload_bytes: The binary data to upload.
+        emit_mock: The mock for the event namespace emit.
     """
     app = App(state=request.getfixturevalue(fixture))
-    app.event_namespace.emit = AsyncMock()  # type: ignore
+    app.event_namespace.emit = emit_mock  # type: ignore
     current_state = app.state_manager.get_state("token")
-    data = b"This is binary data"
-
-    # Create a binary IO object and write data to it
-    bio = io.BytesIO()
-    bio.write(data)
 
+    # Give each file its own stream, so reading one does not drain the other.
     file1 = UploadFile(
         filename="token:file_upload_state.multi_handle_upload:True:image1.jpg",
-        file=bio,
+        file=io.BytesIO(upload_bytes),
     )
     file2 = UploadFile(
         filename="token:file_upload_state.multi_handle_upload:True:image2.jpg",
-        file=bio,
+        file=io.BytesIO(upload_bytes),
     )
     upload_fn = upload(app)
     await upload_fn([file1, file2])
-    state_update = StateUpdate(delta=delta, events=[], final=True)
 
     app.event_namespace.emit.assert_called_with(  # type: ignore
-        "event", state_update.json(), to=current_state.get_sid()
+        "event", _EXPECTED_UPLOAD_UPDATE_JSON[fixture], to=current_state.get_sid()
     )
     assert app.state_manager.get_state("token").dict()["img_list"] == [
         "image1.jpg",
@@ -694,28 +818,23 @@ async def test_upload_file(fixture, request, delta):
 @pytest.mark.parametrize(
     "fixture", ["upload_state", "upload_sub_state", "upload_grand_sub_state"]
 )
-async def test_upload_file_without_annotation(fixture, request):
+async def test_upload_file_without_annotation(fixture, request, upload_bytes):
     """Test that an error is thrown when there's no param annotated with rx.UploadFile or List[UploadFile].
 
     Args:
         fixture: The state.
         request: Fixture request.
+        upload_bytes: The binary data to upload.
     """
-    data = b"This is binary data"
-
-    # Create a binary IO object and write data to it
-    bio = io.BytesIO()
-    bio.write(data)
-
     app = App(state=request.getfixturevalue(fixture))
 
     file1 = UploadFile(
         filename="token:file_upload_state.handle_upload2:True:image1.jpg",
-        file=bio,
+        file=io.BytesIO(upload_bytes),
     )
     file2 = UploadFile(
         filename="token:file_upload_state.handle_upload2:True:image2.jpg",
-        file=bio,
+        file=io.BytesIO(upload_bytes),
     )
     fn = upload(app)
     with pytest.raises(ValueError) as err:
@@ -764,27 +883,50 @@ class DynamicState(State):
         return self.dynamic
 
 
+# The dynamic route var used by the dynamic_app fixture, and the values the
+# parametrized navigation test steps through in order.
+DYNAMIC_ARG_NAME = "dynamic"
+DYNAMIC_ROUTE = f"/test/[{DYNAMIC_ARG_NAME}]"
+DYNAMIC_EXP_VALS = ("foo", "foobar", "baz")
+
+
+@pytest.fixture(scope="module")
+def dynamic_app(index_page) -> App:
+    """An app with a dynamic route var page, built once per module.
+
+    Args:
+        index_page: The index page.
+
+    Returns:
+        The app, with the index page added on a dynamic route.
+    """
+    app = App(state=DynamicState)
+    assert DYNAMIC_ARG_NAME not in app.state.vars
+    app.add_page(index_page, route=DYNAMIC_ROUTE, on_load=DynamicState.on_load)  # type: ignore
+    return app
+
+
 @pytest.mark.asyncio
+@pytest.mark.xdist_group("app_state")
+@pytest.mark.parametrize("exp_index, exp_val", list(enumerate(DYNAMIC_EXP_VALS)))
 async def test_dynamic_route_var_route_change_completed_on_load(
-    index_page,
-    windows_platform: bool,
+    dynamic_app: App, exp_index: int, exp_val: str
 ):
-    """Create app with dynamic route var, and simulate navigation.
+    """Simulate navigation in an app with a dynamic route var.
 
     on_load should fire, allowing any additional vars to be updated before the
-    initial page hydrate.
+    initial page hydrate. Each case resets the shared app's state and replays
+    the navigation sequence up to its own value, so the cases are
+    self-contained and can run in any order.
 
     Args:
-        index_page: The index page.
-        windows_platform: Whether the system is windows.
+        dynamic_app: The app with the dynamic route var page.
+        exp_index: The index of the current navigation.
+        exp_val: The dynamic route var value for the current navigation.
     """
-    arg_name = "dynamic"
-    route = f"/test/[{arg_name}]"
-    if windows_platform:
-        route.lstrip("/").replace("/", "\\")
-    app = App(state=DynamicState)
-    assert arg_name not in app.state.vars
-    app.add_page(index_page, route=route, on_load=DynamicState.on_load)  # type: ignore
+    arg_name = DYNAMIC_ARG_NAME
+    route = DYNAMIC_ROUTE
+    app = dynamic_app
     assert arg_name in app.state.vars
     assert arg_name in app.state.computed_vars
     assert app.state.computed_vars[arg_name].deps(objclass=DynamicState) == {
@@ -795,9 +937,11 @@ async def test_dynamic_route_var_route_change_completed_on_load(
     token = "mock_token"
     sid = "mock_sid"
     client_ip = "127.0.0.1"
+    # Discard any state left over from a previous case, so the replay below
+    # always starts from scratch.
+    app.state_manager.states.pop(token, None)
     state = app.state_manager.get_state(token)
     assert state.dynamic == ""
-    exp_vals = ["foo", "foobar", "baz"]
 
     def _event(name, val, **kwargs):
         return Event(
@@ -810,15 +954,18 @@ async def test_dynamic_route_var_route_change_completed_on_load(
             **kwargs,
         )
 
+    # The formatted handler names are loop-invariant, so compute them once.
+    on_load_name = format.format_event_handler(DynamicState.on_load)  # type: ignore
+    set_is_hydrated_name = format.format_event_handler(
+        DynamicState.set_is_hydrated  # type: ignore
+    )
+    on_counter_name = format.format_event_handler(DynamicState.on_counter)  # type: ignore
+
     def _dynamic_state_event(name, val, **kwargs):
-        return _event(
-            name=format.format_event_handler(getattr(DynamicState, name)),  # type: ignore
-            val=val,
-            **kwargs,
-        )
+        return _event(name=name, val=val, **kwargs)
 
-    for exp_index, exp_val in enumerate(exp_vals):
-        hydrate_event = _event(name=get_hydrate_event(state), val=exp_val)
+    for nav_index, nav_val in enumerate(DYNAMIC_EXP_VALS[: exp_index + 1]):
+        hydrate_event = _event(name=get_hydrate_event(state), val=nav_val)
         exp_router_data = {
             "headers": {},
             "ip": client_ip,
@@ -826,74 +973,80 @@ async def test_dynamic_route_var_route_change_completed_on_load(
             "token": token,
             **hydrate_event.router_data,
         }
-        update = await process(
-            app,
-            event=hydrate_event,
-            sid=sid,
-            headers={},
-            client_ip=client_ip,
-        ).__anext__()  # type: ignore
+        update = await _first_update(
+            process(
+                app,
+                event=hydrate_event,
+                sid=sid,
+                headers={},
+                client_ip=client_ip,
+            )
+        )
 
         # route change triggers: [full state dict, call on_load events, call set_is_hydrated(True)]
         assert update == StateUpdate(
             delta={
                 state.get_name(): {
-                    arg_name: exp_val,
-                    f"comp_{arg_name}": exp_val,
+                    arg_name: nav_val,
+                    f"comp_{arg_name}": nav_val,
                     constants.IS_HYDRATED: False,
-                    "loaded": exp_index,
-                    "counter": exp_index,
-                    # "side_effect_counter": exp_index,
+                    "loaded": nav_index,
+                    "counter": nav_index,
+                    # "side_effect_counter": nav_index,
                 }
             },
             events=[
                 _dynamic_state_event(
-                    name="on_load",
-                    val=exp_val,
+                    name=on_load_name,
+                    val=nav_val,
                     router_data=exp_router_data,
                 ),
                 _dynamic_state_event(
-                    name="set_is_hydrated",
+                    name=set_is_hydrated_name,
                     payload={"value": True},
-                    val=exp_val,
+                    val=nav_val,
                     router_data=exp_router_data,
                 ),
             ],
         )
-        assert state.dynamic == exp_val
-        on_load_update = await process(
-            app,
-            event=_dynamic_state_event(name="on_load", val=exp_val),
-            sid=sid,
-            headers={},
-            client_ip=client_ip,
-        ).__anext__()  # type: ignore
+        assert state.dynamic == nav_val
+        on_load_update = await _first_update(
+            process(
+                app,
+                event=_dynamic_state_event(name=on_load_name, val=nav_val),
+                sid=sid,
+                headers={},
+                client_ip=client_ip,
+            )
+        )
         assert on_load_update == StateUpdate(
             delta={
                 state.get_name(): {
                     # These computed vars _shouldn't_ be here, because they didn't change
-                    arg_name: exp_val,
-                    f"comp_{arg_name}": exp_val,
-                    "loaded": exp_index + 1,
+                    arg_name: nav_val,
+                    f"comp_{arg_name}": nav_val,
+                    "loaded": nav_index + 1,
                 },
             },
             events=[],
         )
-        on_set_is_hydrated_update = await process(
-            app,
-            event=_dynamic_state_event(
-                name="set_is_hydrated", payload={"value": True}, val=exp_val
-            ),
-            sid=sid,
-            headers={},
-            client_ip=client_ip,
-        ).__anext__()  # type: ignore
+        on_set_is_hydrated_update = await _first_update(
+            process(
+                app,
+                event=_dynamic_state_event(
+                    name=set_is_hydrated_name, payload={"value": True}, val=nav_val
+                ),
+                sid=sid,
+                headers={},
+                client_ip=client_ip,
+            )
+        )
         assert on_set_is_hydrated_update == StateUpdate(
             delta={
                 state.get_name(): {
                     # These computed vars _shouldn't_ be here, because they didn't change
-                    arg_name: exp_val,
-                    f"comp_{arg_name}": exp_val,
+                    arg_name: nav_val,
+                    f"comp_{arg_name}": nav_val,
                     "is_hydrated": True,
                 },
             },
@@ -901,28 +1054,29 @@ async def test_dynamic_route_var_route_change_completed_on_load(
         )
 
         # a simple state update event should NOT trigger on_load or route var side effects
-        update = await process(
-            app,
-            event=_dynamic_state_event(name="on_counter", val=exp_val),
-            sid=sid,
-            headers={},
-            client_ip=client_ip,
-        ).__anext__()  # type: ignore
+        update = await _first_update(
+            process(
+                app,
+                event=_dynamic_state_event(name=on_counter_name, val=nav_val),
+                sid=sid,
+                headers={},
+                client_ip=client_ip,
+            )
+        )
         assert update == StateUpdate(
             delta={
                 state.get_name(): {
                     # These computed vars _shouldn't_ be here, because they didn't change
-                    f"comp_{arg_name}": exp_val,
-                    arg_name: exp_val,
-                    "counter": exp_index + 1,
+                    f"comp_{arg_name}": nav_val,
+                    arg_name: nav_val,
+                    "counter": nav_index + 1,
                 }
             },
             events=[],
         )
-    assert state.loaded == len(exp_vals)
-    assert state.counter == len(exp_vals)
-    # print(f"Expected {exp_vals} rendering side effects, got {state.side_effect_counter}")
-    # assert state.side_effect_counter == len(exp_vals)
+    assert state.loaded == exp_index + 1
+    assert state.counter == exp_index + 1
+    # assert state.side_effect_counter == exp_index + 1
 
 
 @pytest.mark.asyncio
@@ -20,7 +20,7 @@ from reflex.utils import (
     types,
 )
 from reflex.utils import exec as utils_exec
-from reflex.vars import BaseVar, Var
+from reflex.vars import BaseVar, ImportVar, NoRenderImportVar, Var
 
 
 def mock_event(arg):
@@ -228,6 +228,25 @@ def test_merge_imports():
     assert set(d["react-dom"]) == {"render"}
 
 
+def test_merge_imports_validated():
+    """Test that imports are merged and validated correctly."""
+    d1 = {"react": {ImportVar(tag="Component")}, "rehype-raw": {NoRenderImportVar()}}
+    d2 = {"react-dom": {ImportVar(tag="render")}, "rehype-katex": {NoRenderImportVar()}}
+    # No-render deps across libraries have no tag and must not conflict.
+    d = imports.merge_imports_validated(d1, d2)
+    assert set(d.keys()) == {"react", "react-dom", "rehype-raw", "rehype-katex"}
+    assert set(d["react"]) == {ImportVar(tag="Component")}
+    assert set(d["rehype-raw"]) == {NoRenderImportVar()}
+
+
+def test_merge_imports_validated_conflict():
+    """Test that merging imports raises when a tag is used from two libraries."""
+    d1 = {"react": {ImportVar(tag="Component")}}
+    d2 = {"preact": {ImportVar(tag="Component")}}
+    with pytest.raises(ValueError):
+        imports.merge_imports_validated(d1, d2)
+
+
 @pytest.mark.parametrize(
     "cls,expected",
     [